@@ -9,4 +9,4 @@ from .specification import Specification
 
 __all__ = [Dataset, Database, Layout, Specification, File, Tag]
 
-Base.metadata.create_all(index.db.engine)
+index.create(Base.metadata)
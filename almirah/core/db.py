@@ -1,25 +1,43 @@
 """Database connection and session management."""
 
+import sqlite3
+
+from typing import Any
+from typing import Dict
+from typing import Optional
+from functools import partial
+
+from sqlalchemy import event
 from sqlalchemy import MetaData
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.engine.base import Connection
 
 
+# Reflected metadata by database URL, as reflection is slow, kept until
+# a manager of the database is closed
+_METADATA = {}
+
+
 class DBManager:
     """Manages database connections and sessions."""
 
     Session = None
 
-    def __init__(self, url: str):
-        self.engine = create_engine(url)
-        self.metadata = MetaData()
-        self.metadata.reflect(bind=self.engine, views=True)
+    def __init__(self, url: str, pragmas: Optional[Dict[str, Any]] = None, **kwargs):
+        self.engine = create_engine(url, **kwargs)
+        if pragmas and self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", partial(_set_sqlite_pragmas, pragmas))
+
+        self.metadata = _reflect(self.engine)
+        self._connection = None
 
     @property
     def connection(self) -> Connection:
-        """Provides a context-managed connection to the database."""
-        return self.engine.connect()
+        """Provides a connection to the database, reused until closed."""
+        if self._connection is None or self._connection.closed:
+            self._connection = self.engine.connect()
+        return self._connection
 
     @property
     def session(self) -> Session:
@@ -28,5 +46,52 @@ class DBManager:
             self.Session = sessionmaker(self.engine)
         return self.Session()
 
+    def close(self) -> None:
+        """Close the shared connection and dispose of the engine pool."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self.engine.dispose()
+
+        # Reflect afresh on reconnecting, as the schema may have changed
+        _METADATA.pop(_metadata_key(self.engine), None)
+
     def __repr__(self) -> str:
         return f"<DBManager url='{self.engine.url}'>"
+
+
+def _metadata_key(engine):
+    """Return key of the reflected metadata of engine, None if not shared."""
+    url = engine.url
+
+    # In-memory SQLite databases are private to each engine
+    if engine.dialect.name == "sqlite" and url.database in {None, "", ":memory:"}:
+        return None
+    return url.render_as_string(hide_password=False)
+
+
+def _reflect(engine):
+    """Return reflected metadata, shared by managers of the same database."""
+    key = _metadata_key(engine)
+    if key not in _METADATA:
+        metadata = MetaData()
+        metadata.reflect(bind=engine, views=True)
+        if key is None:
+            return metadata
+        _METADATA[key] = metadata
+    return _METADATA[key]
+
+
+def _set_sqlite_pragmas(pragmas, dbapi_connection, connection_record):
+    """Tune SQLite connections, skipping pragmas the database refuses."""
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        if value is None:
+            continue
+
+        # Tuning is best effort, journal mode cannot change if read-only
+        try:
+            cursor.execute(f"PRAGMA {name}={value}")
+        except sqlite3.OperationalError:
+            pass
+    cursor.close()
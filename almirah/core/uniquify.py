@@ -23,7 +23,7 @@ def unique(
     Parameters
     ----------
     index : Indexer
-        The almirah index used to store cached instances.
+        The almirah index whose session caches instances.
     cls : Type
         The class of the object being instantiated.
     constructor : Callable
@@ -53,18 +53,17 @@ def unique(
             f"__init__ missing required keyword-only arguments: {commafy(inc)}"
         )
 
-    cache = getattr(index, "_unique_cache", None)
-    if cache is None:
-        index._unique_cache = cache = dict()
+    # Cache lives with the session, as instances belong to the session
+    session = index.session
+    cache = session.info.setdefault("unique_cache", dict())
 
     key = (cls, tuple(idens.values()))
-    with index.session.no_autoflush:
-        obj = constructor(**kwargs)
-        obj = cls.get(**{i: getattr(obj, i) for i in idens}) or obj
-
-        if key in cache:
-            obj = cache[key]
-        else:
+    with session.no_autoflush:
+        # Look up index only for instances not seen before
+        obj = cache.get(key)
+        if obj is None:
+            obj = constructor(**kwargs)
+            obj = cls.get(**{i: getattr(obj, i) for i in idens}) or obj
             cache[key] = obj
 
         index.add(obj)
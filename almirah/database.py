@@ -5,7 +5,11 @@ import requests
 import numpy as np
 import pandas as pd
 
+from contextlib import contextmanager
+
 from sqlalchemy import URL
+from sqlalchemy import func
+from sqlalchemy import select
 from sqlalchemy import Table
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
@@ -30,6 +34,10 @@ from .utils.logging import log_col
 from .utils.sqlalchemy import get_sql_type
 
 
+# Bound parameter limit of SQLite builds older than 3.32
+_SQLITE_MAX_VARIABLES = 999
+
+
 @uniquify(index)
 class Database(Component):
     """Generic database representation."""
@@ -57,7 +65,7 @@ class Database(Component):
 
         if not getattr(self, "db", None):
             raise TypeError(f"Connection to {self} not established")
-        return self.db.connection
+        return self._transaction or self.db.connection
 
     @property
     def worksheet(self):
@@ -112,9 +120,14 @@ class Database(Component):
         cls = [self.build_column(**c) for c in cols]
         cns = [self.build_constraint(**r) for r in refs]
         table = Table(table, self.meta, *cls, *cns, extend_existing=True)
-        table.create(bind=self.connection, checkfirst=True)
+        with self.db.engine.begin() as conn:
+            table.create(bind=conn, checkfirst=True)
 
-    def connect(self, username=None, password=None, keyfile=None):
+        # Keys may have changed with the table extended
+        self._primary.pop(table.name, None)
+        self._foreign.pop(table.name, None)
+
+    def connect(self, username=None, password=None, keyfile=None, pragmas=None):
         """
         Establish a connection to the database.
 
@@ -126,6 +139,9 @@ class Database(Component):
             The database password.
         keyfile : str
             Path to the service account keyfile. Required if backend is gsheet.
+        pragmas : dict, optional
+            SQLite pragmas, such as journal_mode, set on each connection.
+            None of them are set by default.
 
         Raises
         ------
@@ -159,14 +175,36 @@ class Database(Component):
                 database=self.name,
             )
 
-            self.db = DBManager(url)
+            # Close any previous connection so that the schema is reflected anew
+            if getattr(self, "db", None):
+                self.db.close()
+
+            self.db = DBManager(url, pragmas=pragmas)
+            self._primary, self._foreign = {}, {}
+            self._transaction, self._parents = None, None
+
+    def get_foreign(self, table):
+        """Return (parent table, columns, parent columns) for foreign keys."""
+
+        if table not in self._foreign:
+            self._foreign[table] = [
+                (
+                    fkc.referred_table.name,
+                    fkc.column_keys,
+                    [fk.column.name for fk in fkc.elements],
+                )
+                for fkc in self.meta.tables[table].foreign_key_constraints
+            ]
+        return self._foreign[table]
 
     def get_primary(self, table):
         """Return priamry keys for table."""
 
-        return [c.name for c in self.meta.tables[table].primary_key]
+        if table not in self._primary:
+            self._primary[table] = [c.name for c in self.meta.tables[table].primary_key]
+        return self._primary[table]
 
-    def get_records(self, table, cols=None):
+    def get_records(self, table, cols=None, chunksize=None):
         """Retrieve records from table in database as a DataFrame.
 
         Parameters
@@ -175,6 +213,9 @@ class Database(Component):
             Table in database from which to retrieve records.
         cols : list of str
             Column names to select from table.
+        chunksize : int, optional
+            If given, return an iterator of DataFrames with up to
+            chunksize records each. Only supported for connections.
         """
         if self.backend == "request":
             data = {"table": table, "cols": cols}
@@ -199,7 +240,13 @@ class Database(Component):
                 generic_type = column.type.as_generic()
                 dtype[column.name] = python_to_pandas_type(generic_type.python_type)
 
-            records = pd.read_sql_table(table, self.connection, columns=cols)
+            records = pd.read_sql_table(
+                table, self.connection, columns=cols, chunksize=chunksize
+            )
+
+            if chunksize:
+                return (chunk.astype(dtype) for chunk in records)
+
             records = records.astype(dtype)
 
         return records
@@ -217,7 +264,7 @@ class Database(Component):
         threshold=None,
         if_exists="append",
         index=False,
-        insert_method=None,
+        insert_method="multi",
         **kwargs,
     ):
         """Write records in DataFrame to a table.
@@ -250,7 +297,7 @@ class Database(Component):
         index : bool, default False
             Write DataFrame index as a column. Uses index_label as the
             column name in the table.
-        insert_method : {None, 'multi', callable}, optional
+        insert_method : {None, 'multi', callable}, default 'multi'
             Controls the SQL insertion clause used.
             - None : Uses standard SQL INSERT clause (one per row).
             - ‘multi’: Pass multiple values in a single INSERT clause.
@@ -259,7 +306,9 @@ class Database(Component):
             on Insertion method section of :ref:`pandas:io.sql.method`.
         kwargs : key, value mappings
             Other keyword arguments are passed down to
-            :doc:`pandas:reference/api/pandas.DataFrame.to_sql`.
+            :doc:`pandas:reference/api/pandas.DataFrame.to_sql`. Unless
+            given, `chunksize` is set to keep each multi-row INSERT
+            within the bound parameter limit of the backend.
 
         Returns
         -------
@@ -284,27 +333,58 @@ class Database(Component):
             logging.info("Dropping records with missing information")
             df = df.dropna(subset=drop_na, thresh=threshold)
 
-        if check_dups:
-            df = df[self.resolve_dups(df, table, resolve_dups)]
+        with self.transaction() as conn:
+            # Duplicates need a mask only when they are to be logged
+            if check_dups and logging.getLogger().isEnabledFor(logging.ERROR):
+                df = df[self.resolve_dups(df, table, resolve_dups)]
+            elif check_dups:
+                df = df.drop_duplicates(self.get_primary(table), keep=resolve_dups)
+
+            if check_fks:
+                df = df[self.resolve_fks(df, table, resolve_fks)]
+
+            if insert_ignore:
+                mask = common_rows(df, self.get_records(table).astype(df.dtypes))
+                logging.info(f"Ignoring insert of {mask.sum()} common records")
+                df = df[~mask]
+
+            logging.info(f"Inserting {len(df.index)} records")
+
+            if insert_method == "multi" and "chunksize" not in kwargs:
+                kwargs["chunksize"] = self._insert_chunksize(len(df.columns) + index)
+
+            df.to_sql(
+                table,
+                conn,
+                if_exists=if_exists,
+                index=index,
+                method=insert_method,
+                **kwargs,
+            )
 
-        if check_fks:
-            df = df[self.resolve_fks(df, table, resolve_fks)]
+            # Parent keys read earlier are stale once the table changes
+            for key in [k for k in self._parents if k[0] == table]:
+                del self._parents[key]
 
-        if insert_ignore:
-            mask = common_rows(df, self.get_records(table).astype(df.dtypes))
-            logging.info(f"Ignoring insert of {mask.sum()} common records")
-            df = df[~mask]
+    @contextmanager
+    def transaction(self):
+        """
+        Run database operations within a single transaction.
 
-        logging.info(f"Inserting {len(df.index)} records")
+        Reads and writes through `connection` within the context share
+        one connection, committed on exit or rolled back on error.
+        Nested calls join the outer transaction.
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
 
-        df.to_sql(
-            table,
-            self.connection,
-            if_exists=if_exists,
-            index=index,
-            method=insert_method,
-            **kwargs,
-        )
+        with self.db.engine.begin() as conn:
+            self._transaction, self._parents = conn, {}
+            try:
+                yield conn
+            finally:
+                self._transaction, self._parents = None, None
 
     def resolve_dups(self, df, table, resolve=False):
         """
@@ -365,18 +445,17 @@ class Database(Component):
         """
         mask = pd.Series(True, index=df.index)
 
-        for fkc in self.meta.tables[table].foreign_key_constraints:
-            p_cols = [fk.column.name for fk in fkc.elements]
-            p_df = self.get_records(fkc.referred_table.name, p_cols)
-            p_mask = common_rows(df, p_df, fkc.column_keys, p_cols)
+        for parent, cols, p_cols in self.get_foreign(table):
+            p_df = self._parent_records(parent, p_cols)
+            p_mask = common_rows(df, p_df, cols, p_cols)
 
             log_df(df[~p_mask], "Missing parent records")
 
             if not p_mask.all() and resolve:
                 logging.info("Resolving missing records by insert to parent")
                 self.to_table(
-                    df[~p_mask][fkc.column_keys].set_axis(p_cols, axis=1),
-                    fkc.referred_table.name,
+                    df[~p_mask][cols].set_axis(p_cols, axis=1),
+                    parent,
                     check_dups=True,
                     resolve_dups="first",
                     check_fks=True,
@@ -387,13 +466,31 @@ class Database(Component):
             mask &= p_mask
         return mask
 
+    def _parent_records(self, table, cols):
+        """Return parent key records, read once per transaction."""
+        if self._parents is None:
+            return self.get_records(table, cols)
+
+        key = (table, tuple(cols))
+        if key not in self._parents:
+            self._parents[key] = self.get_records(table, cols)
+        return self._parents[key]
+
+    def _insert_chunksize(self, width):
+        """Return rows per multi-row INSERT for records of given width."""
+        if self.db.engine.dialect.name == "sqlite":
+            return max(1, min(1000, _SQLITE_MAX_VARIABLES // max(1, width)))
+        return 10_000
+
     def report(self):
         """Generate report for database."""
         print(f"{self}:")
 
-        for table in self.meta.tables:
-            rows = len(self.get_records(table))
-            print("{:<60} : {:>60} records".format(table, rows))
+        # Count rows in the database rather than fetching every record
+        conn = self.connection
+        for name, table in self.meta.tables.items():
+            rows = conn.scalar(select(func.count()).select_from(table))
+            print("{:<60} : {:>60} records".format(name, rows))
 
     def query(self, returns=None, **filters):
         """Return table records that fit filter criteria."""
@@ -425,6 +522,7 @@ def migrate(
     dry_run=False,
     na_vals=[],
     dtype_kws=None,
+    chunksize=None,
     **kwargs,
 ):
     """
@@ -451,6 +549,10 @@ def migrate(
     dtype_kws : dict, optional
         Key, value pairs that will be passed to
         :func:`almirah.utils.df.convert_column_type` kwargs.
+    chunksize : int, optional
+        If given, source records are read, transformed and inserted
+        chunksize records at a time to bound memory use. Duplicate
+        checks and reshape steps then only see one chunk at a time.
     kwargs : key, value mappings
         Other keyword arguments are passed down to
         `almirah.Database.to_table`.
@@ -461,21 +563,30 @@ def migrate(
         logging.info(f"Transferring table {m['maps']} -> {m['table']}")
 
         # Extract source records
-        records = src.get_records(m["maps"]).replace(na, pd.NA)
+        if chunksize:
+            chunks = src.get_records(m["maps"], chunksize=chunksize)
+        else:
+            chunks = [src.get_records(m["maps"])]
+
+        if not dry_run:
+            cols = m["cols"] + m.get("attach", [])
+            dst.create_table(m["table"], cols, m.get("refs", []))
 
-        # Transform and validate
-        records = transform(records, dtype_kws, m)
-        mask = validate(records, m)
+        for records in chunks:
+            records = records.replace(na, pd.NA)
 
-        # Reshape data records
-        df = reshape(records[mask], m.get("reshape", dict()))
+            # Transform and validate
+            records = transform(records, dtype_kws, m)
+            mask = validate(records, m)
 
-        if dry_run:
-            continue
+            # Reshape data records
+            df = reshape(records[mask], m.get("reshape", dict()))
 
-        # Load records into target
-        dst.create_table(m["table"], m["cols"] + m.get("attach", []), m.get("refs", []))
-        dst.to_table(df, m["table"], threshold=m.get("threshold"), **kwargs)
+            if dry_run:
+                continue
+
+            # Load records into target
+            dst.to_table(df, m["table"], threshold=m.get("threshold"), **kwargs)
 
 
 def reshape(records, steps):
@@ -561,10 +672,11 @@ def transform_column(series, dtype_kws=dict(), **kwargs):
     """Transform column to appropriate datatype."""
 
     hide = kwargs.get("hide", False)
-    s, error = series.copy(deep=True), series.isna()
+    # Steps below return new series, so the source is never modified
+    s, error = series, series.isna()
 
     if pat := kwargs.get("extract"):
-        s = s.astype(str).str.extract(pat, expand=False)
+        s = _as_str(s).str.extract(pat, expand=False)
         logging.info(f"Extracting and replacing based on pattern {pat}")
 
     if rep := kwargs.get("replace"):
@@ -611,7 +723,7 @@ def validate_column(series, **kwargs):
         log_col(series[~m], "Primary column values cannot be NA", hide=hide)
 
     if pat := kwargs.get("like"):
-        mask &= (m := series.astype(str).str.fullmatch(pat) | series.isna())
+        mask &= (m := _as_str(series).str.fullmatch(pat) | series.isna())
         log_col(series[~m], f"Values do not match pattern {pat}", hide=hide)
 
     if bounds := kwargs.get("between"):
@@ -623,3 +735,10 @@ def validate_column(series, **kwargs):
         log_col(series[~m], f"Values not in {members}", hide=hide)
 
     return mask
+
+
+def _as_str(series):
+    """Return series as strings, without a copy if already of string dtype."""
+    if isinstance(series.dtype, pd.StringDtype):
+        return series
+    return series.astype(str)
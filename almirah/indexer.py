@@ -1,6 +1,7 @@
 """Indexing functionality for metadata search and filtering."""
 
 import os
+import logging
 import traceback
 
 from typing import Any
@@ -8,17 +9,30 @@ from typing import List
 from typing import Type
 
 from sqlalchemy import select
+from sqlalchemy import MetaData
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import OperationalError
 
 from .core import DBManager
 
 
+# Tuning for bulk writes while indexing, WAL persists in the database file
+_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -65536,
+}
+
+
 class Indexer:
     """Interface to interact with the index."""
 
     db = None
     path = None
-    _session = None
+    _sessions = None
 
     def __init__(self, path=None, read_only=False):
         if not Indexer.db and not path:
@@ -26,7 +40,11 @@ class Indexer:
 
         if not Indexer.db or not Indexer.path:
             Indexer.path = os.path.expanduser(path)
-            Indexer.db = DBManager(f"sqlite:///{Indexer.path}")
+            Indexer.db = DBManager(
+                f"sqlite:///{Indexer.path}",
+                pragmas=None if read_only else _PRAGMAS,
+                connect_args={"timeout": 30},
+            )
             Indexer.read_only = read_only
 
     def _build_query(self, cls: Type[Any], **kwargs) -> Any:
@@ -53,6 +71,20 @@ class Indexer:
         if not Indexer.read_only:
             self.session.commit()
 
+    def create(self, metadata: MetaData) -> None:
+        """Create tables and indexes of metadata missing from the index."""
+        metadata.create_all(Indexer.db.engine)
+        if Indexer.read_only:
+            return
+
+        # Add indexes missing from tables created by earlier versions
+        try:
+            for table in metadata.sorted_tables:
+                for table_index in table.indexes:
+                    table_index.create(Indexer.db.engine, checkfirst=True)
+        except OperationalError as e:
+            logging.warning(f"Unable to add missing indexes to {self}: {e}")
+
     def get(self, cls: Type[Any], **identifiers) -> Any:
         """Retrieve a single object based on the identifiers."""
         stmt = self._build_query(cls, **identifiers)
@@ -63,8 +95,13 @@ class Indexer:
         stmt = self._build_query(cls, **filters)
         return self.retrieve(stmt).all()
 
-    def retrieve(self, stmt):
-        return self.session.scalars(stmt)
+    def remove(self) -> None:
+        """Close the session of the calling thread, dropping its cached objects."""
+        if Indexer._sessions:
+            Indexer._sessions.remove()
+
+    def retrieve(self, stmt, params=None):
+        return self.session.scalars(stmt, params)
 
     def rollback(self):
         """Roll back the current transaction."""
@@ -72,9 +109,10 @@ class Indexer:
 
     @property
     def session(self):
-        if not Indexer._session:
-            Indexer._session = Indexer.db.session
-        return Indexer._session
+        """Session of the calling thread, created on first use."""
+        if not Indexer._sessions:
+            Indexer._sessions = scoped_session(sessionmaker(Indexer.db.engine))
+        return Indexer._sessions()
 
     def __repr__(self):
         return f"<Indexer path='{Indexer.path}'>"
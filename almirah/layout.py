@@ -2,17 +2,28 @@
 
 import os
 import re
+import sys
 
 from typing import List
 from typing import Dict
 
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+
 from datalad.api import get
 from datalad.api import clone
 
 from sqlalchemy import or_
+from sqlalchemy import cast
 from sqlalchemy import and_
+from sqlalchemy import event
 from sqlalchemy import func
+from sqlalchemy import delete
 from sqlalchemy import select
+from sqlalchemy import String
+from sqlalchemy import literal
+from sqlalchemy import tuple_
+from sqlalchemy import bindparam
 from sqlalchemy import ForeignKey
 from sqlalchemy import UniqueConstraint
 from sqlalchemy import ForeignKeyConstraint
@@ -21,6 +32,9 @@ from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import mapped_column
 from sqlalchemy.orm import attribute_keyed_dict
+from sqlalchemy.orm.attributes import set_committed_value
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from sqlalchemy.ext.associationproxy import AssociationProxy
 from sqlalchemy.ext.associationproxy import association_proxy
@@ -33,9 +47,14 @@ from .specification import Specification
 
 from .utils.gen import listify
 from .utils.gen import denest_dict
+from .utils.gen import expand_user
 from .utils.gen import get_metadata
 
 
+# Values cast per statement, kept under SQLite's bound parameter limit
+_CAST_CHUNKSIZE = 500
+
+
 @uniquify(index)
 class Layout(Component):
     """Represents a structured layout of files in a directory."""
@@ -72,7 +91,7 @@ class Layout(Component):
         specification_name : str
             The name of the specification to apply to this layout.
         """
-        self.root = os.path.expanduser(root)
+        self.root = expand_user(root)
         self.specification_name = specification_name
 
     def add(self, *files: List["File"]):
@@ -93,6 +112,111 @@ class Layout(Component):
             raise TypeError(f"Found file outside layout scope of {self.root}")
         self.files.extend(files)
 
+    def bulk_add(self, *paths):
+        """
+        Add files at paths to the layout in bulk.
+
+        Rows are written with a single statement instead of creating a
+        File object, and looking it up in the index, for every path.
+
+        Parameters
+        ----------
+        paths : str
+            One or more paths within the layout root.
+
+        Returns
+        -------
+        ids : dict
+            Mapping of paths to the ids of their files in the index.
+        """
+        if not all(p.startswith(self.root) for p in paths):
+            raise TypeError(f"Found file outside layout scope of {self.root}")
+
+        # Write pending changes so that rows are visible to the insert
+        index.session.flush()
+        if not paths:
+            return {}
+
+        # Find files already indexed in layout with a single query
+        query = select(File.path, File.id).where(File.root == self.root)
+        ids = dict(index.session.execute(query).all())
+
+        rows = [{"path": p, "root": self.root} for p in paths if p not in ids]
+        if not rows:
+            return ids
+
+        # Insert new files, moving paths indexed elsewhere into this layout
+        stmt = sqlite_insert(File.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[stmt.table.c.path],
+            set_={"root": stmt.excluded.root},
+        )
+        index.session.connection().execute(stmt, rows)
+
+        # Files loaded in session no longer reflect the layout
+        index.session.expire(self, ["files"])
+
+        return dict(index.session.execute(query).all())
+
+    def bulk_tag(self, tags, reset=False):
+        """
+        Mark files in the layout with tags in bulk.
+
+        Bypasses per-tag instantiation through the ORM, which issues a
+        look-up for every tag assigned to a file.
+
+        Parameters
+        ----------
+        tags : dict
+            Mapping of file ids to the name:value tag pairs marking them.
+        reset : bool, default False
+            If True, existing tags marking the files are removed first.
+        """
+        # Write rows with Core statements to skip ORM bulk handling
+        conn = index.session.connection()
+
+        if reset and tags:
+            markings = Marking.__table__
+            conn.execute(delete(markings).where(markings.c.file_id.in_(tags)))
+
+        # Tag values are stored as text, so key them on their stored form
+        tags = _as_stored(conn, tags)
+
+        pairs = {(n, v) for t in tags.values() for n, v in t.items()}
+        if not pairs:
+            return
+
+        # Insert tags not already present in index
+        conn.execute(
+            sqlite_insert(Tag.__table__).on_conflict_do_nothing(),
+            [{"name": n, "value": v} for n, v in pairs],
+        )
+
+        # Retrieve ids of all required tags in one go
+        stmt = select(Tag.id, Tag.name, Tag.value)
+        stmt = stmt.where(tuple_(Tag.name, Tag.value).in_(pairs))
+        ids = {(n, v): i for i, n, v in conn.execute(stmt)}
+
+        # Mark files, replacing existing tag of the same name
+        stmt = sqlite_insert(Marking.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[stmt.table.c.file_id, stmt.table.c.name],
+            set_={"tag_id": stmt.excluded.tag_id},
+        )
+        conn.execute(
+            stmt,
+            [
+                {"file_id": f, "tag_id": ids[(n, v)], "name": n}
+                for f, t in tags.items()
+                for n, v in t.items()
+            ],
+        )
+
+        # Expire stale tag collections of files loaded in session
+        for obj in list(index.session.identity_map.values()):
+            if isinstance(obj, File) and obj.id in tags:
+                index.session.expire(obj, ["_tags"])
+
     def clone(self, url=None):
         """Clone Layout from datalad url."""
         if not self.url and not url:
@@ -110,17 +234,26 @@ class Layout(Component):
         valid_only=True,
         skip=None,
         reset=False,
+        workers=None,
         **funcs,
     ):
-        """Perform indexing to add files in root to index."""
+        """
+        Perform indexing to add files in root to index.
+
+        Paths are handed to a pool of worker threads for tag
+        extraction as they are found. Once the whole tree has been
+        scanned, the collected files and their tags are written to the
+        index in bulk, so tags of every file are held in memory until
+        then.
+        """
 
         # Start from scratch if reset set
         if reset:
             self.files = []
 
-        # If skip provided, construct regex string
+        # If skip provided, construct regex
         if skip:
-            skip_regex = "(" + ")|(".join(skip) + ")"
+            skip = re.compile("(" + ")|(".join(skip) + ")")
 
         # If path not provided, index layout root
         if not root:
@@ -130,24 +263,49 @@ class Layout(Component):
         if not root.startswith(self.root):
             raise ValueError(f"{root} does not belong to {self}")
 
-        for entry in os.scandir(root):
-            if skip and re.match(skip_regex, str(entry)):
-                continue
+        def extract(path, path_tags):
+            return path, collect_tags(path, path_tags, metadata, **funcs)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(extract, path, path_tags)
+                for path, path_tags in self._scan(root, valid_only, skip)
+            ]
+
+            indexed = dict(future.result() for future in futures)
+
+        # Write files and then their tags in bulk
+        ids = self.bulk_add(*indexed)
+        self.bulk_tag({ids[p]: t for p, t in indexed.items()}, reset=reset)
+
+    def _scan(self, root, valid_only=True, skip=None):
+        """Yield paths within root that are to be indexed with their tags."""
+        stack = [root]
+        while stack:
+            path = stack.pop()
 
-            path = os.path.join(root, entry)
-            rel_path = os.path.relpath(path, self.root)
-            path_valid = True
+            # Resolve relative directory once and join entry names onto it
+            rel_dir = os.path.relpath(path, self.root)
+            rel_dir = "" if rel_dir == os.curdir else rel_dir + os.sep
 
-            if valid_only and not self.specification.validate_path(rel_path):
-                path_valid = False
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if skip and skip.match(str(entry)):
+                        continue
 
-            if not path_valid and entry.is_dir():
-                self.index(path, metadata, valid_only, skip, reset, **funcs)
+                    rel_path = rel_dir + entry.name
 
-            if path_valid:
-                file = File(path=path)
-                self.add(file)
-                file.index(metadata, reset, **funcs)
+                    # Validation extracts tags, so reuse them for indexing
+                    if valid_only:
+                        tags = self.specification.match(rel_path)
+                    else:
+                        tags = self.specification.extract_tags(rel_path)
+
+                    if tags is not None:
+                        yield entry.path, tags
+
+                    elif entry.is_dir():
+                        stack.append(entry.path)
 
     def query(self, returns="file", **filters):
         """Return File instances that fit filter criteria."""
@@ -157,32 +315,42 @@ class Layout(Component):
 
         filters = listify(filters)
 
-        # Combine table for consolidated view
-        combine = select(File).join(Marking).join(Tag)
-
-        # Dynamically add conditions for filtering
-        conditions = [and_(Tag.name == n, Tag.value.in_(v)) for n, v in filters.items()]
-
-        # Combine conditions using AND to find matches
-        match = combine.where(File.root == self.root).where(or_(*conditions))
-
-        # Trim down matches to only those that have all mentioned tags
-        trim = match.group_by(File).having(func.count(Tag.name) == len(filters))
-
-        # Retrieve File objects
-        files = index.retrieve(trim).all()
+        # Reuse statement built for the same number of filters
+        trim = _filter_statement(len(filters))
+        params = {"root": self.root}
+        for i, (n, v) in enumerate(filters.items()):
+            params[f"name_{i}"], params[f"values_{i}"] = n, v
 
         if returns == "file":
-            return files
+            return index.retrieve(trim, params).all()
+
+        # Read columns directly for large results instead of building Files
+        if returns in ["path", "rel_path"]:
+            paths = index.retrieve(trim.with_only_columns(File.path), params).all()
+            if returns == "path":
+                return paths
+
+            prefix = self.root if self.root.endswith(os.sep) else self.root + os.sep
+            return [
+                p[len(prefix) :]
+                if p.startswith(prefix)
+                else os.path.relpath(p, self.root)
+                for p in paths
+            ]
+
+        returns = [returns] if isinstance(returns, str) else returns
+        ids = index.retrieve(trim.with_only_columns(File.id), params).all()
 
-        elif returns == "path":
-            return [f.path for f in files]
+        # Fetch requested tag values of all matching files in one go
+        stmt = select(Marking.file_id, Tag.name, Tag.value).select_from(Marking)
+        stmt = stmt.join(Tag).where(Tag.name.in_(returns))
+        stmt = stmt.where(Marking.file_id.in_(trim.with_only_columns(File.id)))
 
-        elif returns == "rel_path":
-            return [f.rel_path for f in files]
+        values = {i: {} for i in ids}
+        for i, n, v in index.session.execute(stmt, params):
+            values[i][n] = v
 
-        returns = [returns] if isinstance(returns, str) else returns
-        return [[f.tags.get(t) for t in returns] for f in files]
+        return [[values[i].get(t) for t in returns] for i in ids]
 
     def move_root(self, path):
         """Abstractly move Layout and its entries to path."""
@@ -209,12 +377,15 @@ class File(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     path: Mapped[str] = mapped_column(unique=True, nullable=False)
-    root: Mapped[str] = mapped_column(ForeignKey("layouts.root"), nullable=True)
+    root: Mapped[str] = mapped_column(
+        ForeignKey("layouts.root"), nullable=True, index=True
+    )
 
     _tags: Mapped[Dict[str, "Tag"]] = relationship(
         secondary="markings",
         back_populates="files",
         collection_class=attribute_keyed_dict("name"),
+        lazy="selectin",
     )
 
     layout: Mapped["Layout"] = relationship()
@@ -223,7 +394,7 @@ class File(Base):
     )
 
     def __init__(self, *, path):
-        self.path = os.path.expanduser(path)
+        self.path = expand_user(path)
 
     @property
     def attached(self):
@@ -231,9 +402,27 @@ class File(Base):
 
     @property
     def rel_path(self):
-        if not self.attached:
-            raise TypeError(f"{self} not attached to a Layout")
-        return os.path.relpath(self.path, self.root)
+        root = self.root
+        if root is None:
+            if not self.attached:
+                raise TypeError(f"{self} not attached to a Layout")
+            root = self.layout.root
+
+        # Reuse last result while neither path nor root has moved
+        path = self.path
+        cached = self.__dict__.get("_rel_path")
+        if cached and cached[0] is path and cached[1] is root:
+            return cached[2]
+
+        # Files lie within their root, so slicing avoids normalizing paths
+        prefix = root if root.endswith(os.sep) else root + os.sep
+        if path.startswith(prefix):
+            rel_path = path[len(prefix) :]
+        else:
+            rel_path = os.path.relpath(path, root)
+
+        self.__dict__["_rel_path"] = (path, root, rel_path)
+        return rel_path
 
     def download(self):
         """Download file from remote dataset."""
@@ -246,24 +435,21 @@ class File(Base):
 
         get(self.path, dataset=self.layout.root)
 
-    def index(self, metadata=False, reset=False, **funcs):
+    def index(self, metadata=False, reset=False, tags=None, **funcs):
         """Perform indexing to add tags marking the file to index."""
 
         # Start from scratch if reset set
         if reset:
             self.tags = {}
 
-        if metadata:
-            meta = get_metadata(self.path)
-            meta = denest_dict(meta)
-            self.tags.update(meta)
-
-        if self.attached:
-            t = self.layout.specification.extract_tags(self.rel_path)
-            self.tags.update(t)
+        # Extract tags unless already provided
+        if tags is None:
+            t = {}
+            if self.attached:
+                t = self.layout.specification.extract_tags(self.rel_path)
+            tags = collect_tags(self.path, t, metadata, **funcs)
 
-        t = {n: f(self.path) for n, f in funcs.items()}
-        self.tags.update(t)
+        self.tags.update(tags)
 
     def report(self):
         """Generate report for the File."""
@@ -282,16 +468,16 @@ class Tag(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(nullable=False)
-    value: Mapped[str] = mapped_column(nullable=False)
+    value: Mapped[str] = mapped_column(nullable=False, index=True)
 
     files: Mapped[List["File"]] = relationship(
-        secondary="markings", back_populates="_tags"
+        secondary="markings", back_populates="_tags", lazy="raise"
     )
 
     __table_args__ = (UniqueConstraint("name", "value"),)
 
     def __init__(self, *, name, value):
-        self.name, self.value = name, value
+        self.name, self.value = sys.intern(name), value
 
     def __repr__(self):
         return f"<Tag {self.name}: '{self.value}'>"
@@ -303,7 +489,7 @@ class Marking(Base):
     __tablename__ = "markings"
 
     file_id: Mapped[int] = mapped_column(ForeignKey("files.id"), primary_key=True)
-    tag_id: Mapped[int] = mapped_column(primary_key=True)
+    tag_id: Mapped[int] = mapped_column(primary_key=True, index=True)
     name: Mapped[str] = mapped_column(nullable=False)
 
     __table_args__ = (
@@ -313,3 +499,73 @@ class Marking(Base):
 
     def __repr__(self):
         return f"<Marking file: {self.file_id} tag: {self.tag_id}>"
+
+
+@event.listens_for(File, "load")
+def _intern_file_root(target, context):
+    """Share one string object across files of the same root."""
+    if target.root is not None:
+        set_committed_value(target, "root", sys.intern(target.root))
+
+
+@event.listens_for(Tag, "load")
+def _intern_tag_name(target, context):
+    """Share one string object across tags of the same name."""
+    set_committed_value(target, "name", sys.intern(target.name))
+
+
+@lru_cache(maxsize=256)
+def _filter_statement(count):
+    """Return statement selecting files of a root that match count filters."""
+
+    # Combine table for consolidated view
+    combine = select(File).join(Marking).join(Tag)
+
+    # Add conditions for filtering, with values bound at execution
+    conditions = [
+        and_(
+            Tag.name == bindparam(f"name_{i}"),
+            Tag.value.in_(bindparam(f"values_{i}", expanding=True)),
+        )
+        for i in range(count)
+    ]
+
+    # Combine conditions using AND to find matches
+    match = combine.where(File.root == bindparam("root")).where(or_(*conditions))
+
+    # Trim down matches to only those that have all mentioned tags
+    return match.group_by(File).having(func.count(Tag.name) == count)
+
+
+def _as_stored(conn, tags):
+    """Return tags with values in the text form they are stored as in index."""
+    values = list(
+        {(type(v), v) for t in tags.values() for v in t.values() if type(v) is not str}
+    )
+
+    # Let SQLite cast values so that they match what column affinity stores
+    stored = {}
+    for i in range(0, len(values), _CAST_CHUNKSIZE):
+        chunk = values[i : i + _CAST_CHUNKSIZE]
+        row = conn.execute(select(*(cast(literal(v), String) for _, v in chunk)))
+        stored.update(zip(chunk, row.one()))
+
+    if not stored:
+        return tags
+
+    return {
+        f: {n: v if type(v) is str else stored[(type(v), v)] for n, v in t.items()}
+        for f, t in tags.items()
+    }
+
+
+def collect_tags(path, path_tags=None, metadata=False, **funcs):
+    """Return tags marking the file at path without touching the index."""
+    tags = {}
+
+    if metadata:
+        tags.update(denest_dict(get_metadata(path)))
+
+    tags.update(path_tags or {})
+    tags.update({n: f(path) for n, f in funcs.items()})
+    return tags
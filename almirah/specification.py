@@ -6,6 +6,8 @@ import logging
 import pandas as pd
 
 from string import Formatter
+from collections import ChainMap
+from functools import lru_cache
 
 from sqlalchemy.orm import Mapped
 from sqlalchemy.orm import mapped_column
@@ -16,7 +18,7 @@ from .core import Base
 from .core import uniquify
 from .indexer import index
 
-from .utils.gen import copy
+from .utils.gen import copy_many
 from .utils.gen import filename
 from .utils.gen import read_yaml
 from .utils.gen import get_dir_contents
@@ -25,6 +27,8 @@ from .utils.gen import get_dir_contents
 _TAG_PATTERN_TEMPLATE = re.compile(
     r"({([\w\d]*?)(?:<([^>]+)>)?(?:\|((?:\.?[\w])+))?\})"
 )
+_OPTIONAL_PATTERN = re.compile(r"(\[.*?\])")
+_OPTIONAL_TAG_PATTERN = re.compile(r"\{(.*?)\}")
 
 
 @uniquify(index)
@@ -71,58 +75,9 @@ class Specification(Base):
             ext = tags.get("extension")
             tags["extension"] = ext if ext.startswith(".") else "." + ext
 
-        # Attempt to match pattern with tags and return first match
-        for pattern in path_patterns:
-            path = pattern
-            matches = _TAG_PATTERN_TEMPLATE.findall(pattern)
-
-            # Do not tamper with tags provided so that
-            # it can be used for other patterns
-            tags_copy = tags.copy()
-
-            # Skip if strict set and all tags not matched
-            if strict and set(tags_copy.keys()) - set([t[1] for t in matches]):
-                continue
-
-            # Validate and fill in missing tags with default value
-            for subpat, name, valid_vals, default in matches:
-                valid = [v for v in valid_vals.split("|")]
-
-                if valid and name in tags_copy and tags_copy[name] not in valid:
-                    continue
-
-                if name not in tags_copy and default:
-                    tags_copy[name] = default
-
-                if valid and default and default not in valid:
-                    raise ValueError(f"Inconsistent default in pattern {subpat}")
-
-                # Simplify path
-                path = path.replace(subpat, "{%s}" % name)
-
-            # Keep or remove optional tags
-            optional_patterns = re.findall(r"(\[.*?\])", path)
-            for op in optional_patterns:
-                optional_tag = re.findall(r"\{(.*?)\}", op)[0]
-                path = (
-                    path.replace(op, op[1:-1])
-                    if optional_tag in tags_copy.keys()
-                    else path.replace(op, "")
-                )
-
-            # Find fields available in path
-            fields = [f[1] for f in Formatter().parse(path)]
-
-            # Proceed only if all field data available
-            if set(fields) - set(tags_copy.keys()):
-                continue
-
-            # Fill in the fields
-            path = path.format_map(tags_copy)
-
-            return path
-
-        return None
+        # Key on value types too so that, say, 1 and True are not conflated
+        tag_items = frozenset((k, type(v), v) for k, v in tags.items())
+        return _build_path(tuple(path_patterns), strict, tag_items)
 
     @staticmethod
     def create_from_file(path):
@@ -136,9 +91,9 @@ class Specification(Base):
         """Return tag:value pairs based on file path."""
         t = {}
         for tag in self.details.get("tags"):
-            val = re.findall(tag["pattern"], path)
-            if val:
-                t[tag["name"]] = val[0]
+            m = _compile_pattern(tag["pattern"]).search(path)
+            if m:
+                t[tag["name"]] = _match_value(m)
         return t
 
     @classmethod
@@ -151,6 +106,13 @@ class Specification(Base):
 
         return obj
 
+    def match(self, path):
+        """Return tags extracted from path if valid, else None."""
+        tags = self.extract_tags(path)
+        if self.build_path(**tags) == path:
+            return tags
+        return None
+
     def organize(self, rules):
         """
         Create organized copy of source directories based on defined rules.
@@ -179,10 +141,32 @@ class Specification(Base):
         if overwrite:
             logging.warning("Overwrite set: Existing files will be overwritten")
 
+        mode = rules.get("mode", "copy")
+
         add = rules.get("add", None)
         for a in add or []:
             logging.info(f"File {a['path']} will be added as {a['position']}.")
 
+        # Patterns of tag rules without a fixed value, compiled up front
+        tag_rules = [
+            (rule, None if "value" in rule else _compile_pattern(rule.get("pattern")))
+            for rule in rules.get("tag_rules")
+        ]
+        copy_fellows = rules.get("copy_fellows", False)
+        rename_rules = [
+            (_compile_pattern(rule.get("target")), rule.get("suffix"))
+            for rule in rules.get("rename_rules", [])
+        ]
+
+        # Files per source directory, listed once for all its matches
+        dir_files = {}
+
+        # Tag value mapping tables, read once per file path
+        mappings = {}
+
+        # Copies are collected as (source, destination) and run together
+        copies, additions = [], []
+
         logging.debug(f"Matching contents with pattern {rules.get('pattern')}")
 
         # Organize files matching pattern using rules
@@ -192,7 +176,7 @@ class Specification(Base):
 
             # Extract tags for file
             tags = {}
-            for rule in rules.get("tag_rules"):
+            for rule, pattern in tag_rules:
                 tag_name = rule.get("name")
                 logging.debug(f"Foraging for {tag_name} tag")
 
@@ -201,7 +185,7 @@ class Specification(Base):
                     tags[tag_name] = val
                     logging.debug(f"Setting tag with {val}")
                 else:
-                    match = re.findall(rule.get("pattern"), file)
+                    match = pattern.findall(file)
                     if match and len(match) != 1:
                         logging.warning("Expected single match, found more.")
 
@@ -251,7 +235,9 @@ class Specification(Base):
                         rep = rule.get("replace")
                         col, with_, from_ = [rep[x] for x in ["col", "with", "from"]]
                         logging.info(f"File {from_} will be used to map tag values")
-                        mapping = pd.read_csv(from_, dtype=str)
+                        if from_ not in mappings:
+                            mappings[from_] = pd.read_csv(from_, dtype=str)
+                        mapping = mappings[from_]
 
                         # TODO: Modularize below code snippet
                         m = mapping.where(mapping[col] == val).dropna()
@@ -280,8 +266,7 @@ class Specification(Base):
 
             new_path = os.path.join(dst, rel_path)
             logging.info(f"Target destination path is {new_path}")
-            copy(file, new_path, overwrite)
-            logging.info("Moved file to target")
+            copies.append((file, new_path))
 
             if add:
                 for addition in add:
@@ -297,19 +282,20 @@ class Specification(Base):
                         raise ValueError(
                             "Expected position to be either content or fellow"
                         )
-                    copy(addition["path"], addition_path, overwrite)
-                    logging.info(f"Added addition at {addition_path}")
+                    additions.append((addition["path"], addition_path))
 
-            if not rules.get("copy_fellows", False):
+            if not copy_fellows:
                 continue
 
             # Find fellows
             logging.info("Initiating copying of fellow files")
-            fellows = [
-                f.path
-                for f in os.scandir(os.path.dirname(file))
-                if f.name != os.path.basename(file) and not f.is_dir()
-            ]
+            file_dir, file_base = os.path.split(file)
+            if file_dir not in dir_files:
+                with os.scandir(file_dir) as it:
+                    dir_files[file_dir] = [
+                        (f.name, f.path) for f in it if not f.is_dir()
+                    ]
+            fellows = [p for name, p in dir_files[file_dir] if name != file_base]
             logging.info(f"Found {len(fellows)} fellows accompanying the file")
 
             for fellow in fellows:
@@ -317,9 +303,8 @@ class Specification(Base):
                 logging.info(f"Changing tags for fellow {fellow}")
                 tags_copy = tags.copy()
                 tags_copy.update({"extension": os.path.splitext(fellow)[1]})
-                for rule in rules.get("rename_rules", []):
-                    if re.findall(rule.get("target"), fellow):
-                        tag_val = rule.get("suffix")
+                for target, tag_val in rename_rules:
+                    if target.search(fellow):
                         tags_copy.update({"suffix": tag_val})
                         logging.info(f"File marked with suffix:{tag_val} tag")
 
@@ -330,7 +315,12 @@ class Specification(Base):
                     continue
                 new_path = os.path.join(dst, rel_path)
                 logging.info(f"Target destination path is {new_path}")
-                copy(fellow, new_path, overwrite)
+                copies.append((fellow, new_path))
+
+        # Additions go in last as they may be placed within copied content
+        workers = rules.get("workers", None)
+        copy_many(copies, overwrite, mode, workers)
+        copy_many(additions, overwrite, mode, workers)
 
     @property
     def tags(self):
@@ -339,10 +329,103 @@ class Specification(Base):
 
     def validate_path(self, path):
         """Return True if path is valid according to specification."""
-        tags = self.extract_tags(path)
-        if self.build_path(**tags) == path:
-            return True
-        return False
+        return self.match(path) is not None
 
     def __repr__(self):
         return f"<Specification name: '{self.name}'>"
+
+
+@lru_cache(maxsize=4096)
+def _build_path(path_patterns, strict, tag_items):
+    """Return path built from the first pattern matching the tags, if any."""
+    tags = {k: v for k, _, v in tag_items}
+
+    # Attempt to match pattern with tags and return first match
+    for pattern in path_patterns:
+        matches, defined = _parse_path_pattern(pattern)
+
+        # Skip if strict set and all tags not matched
+        if strict and not tags.keys() <= defined:
+            continue
+
+        # Defaults go in a layer over the tags provided so that
+        # they can be used for other patterns
+        tags_copy = ChainMap({}, tags)
+
+        # Validate and fill in missing tags with default value
+        skipped = []
+        for pos, (subpat, name, valid, default) in enumerate(matches):
+            if name in tags_copy and tags_copy[name] not in valid:
+                skipped.append(pos)
+                continue
+
+            if name not in tags_copy and default:
+                tags_copy[name] = default
+
+            if default and default not in valid:
+                raise ValueError(f"Inconsistent default in pattern {subpat}")
+
+        template, fields = _resolve_template(
+            pattern, tuple(skipped), frozenset(tags_copy)
+        )
+
+        # Proceed only if all field data available
+        if not fields <= tags_copy.keys():
+            continue
+
+        # Fill in the fields
+        return template.format_map(tags_copy)
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def _parse_path_pattern(pattern):
+    """Return tag subpatterns in path pattern and the set of tags defined."""
+    matches = tuple(
+        (subpat, name, frozenset(valid.split("|")), default)
+        for subpat, name, valid, default in _TAG_PATTERN_TEMPLATE.findall(pattern)
+    )
+    return matches, frozenset(m[1] for m in matches)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_template(pattern, skipped, present):
+    """
+    Return format template for a path pattern and the fields it needs.
+
+    The template depends only on the pattern, the positions of tag
+    subpatterns left unsimplified due to invalid values and the tags
+    present, so it is resolved once per combination of these.
+    """
+    path = pattern
+    for pos, (subpat, name, _, _) in enumerate(_parse_path_pattern(pattern)[0]):
+        if pos not in skipped:
+            path = path.replace(subpat, "{%s}" % name)
+
+    # Keep or remove optional tags
+    for op in _OPTIONAL_PATTERN.findall(path):
+        optional_tag = _OPTIONAL_TAG_PATTERN.findall(op)[0]
+        path = (
+            path.replace(op, op[1:-1])
+            if optional_tag in present
+            else path.replace(op, "")
+        )
+
+    # Find fields available in path
+    fields = frozenset(f[1] for f in Formatter().parse(path))
+    return path, fields
+
+
+@lru_cache(maxsize=None)
+def _compile_pattern(pattern):
+    """Return compiled regex for a specification pattern."""
+    return re.compile(pattern)
+
+
+def _match_value(m):
+    """Return value of match as the first item of `re.findall` would be."""
+    if m.re.groups == 0:
+        return m.group()
+    groups = m.groups("")
+    return groups[0] if len(groups) == 1 else groups
@@ -1,6 +1,7 @@
 from .gen import read_yaml
 from .gen import read_multi_yaml
+from .gen import iter_multi_yaml
 
 from .lib import create_tutorial_dataset
 
-__all__ = [read_yaml, read_multi_yaml, create_tutorial_dataset]
+__all__ = [read_yaml, read_multi_yaml, iter_multi_yaml, create_tutorial_dataset]
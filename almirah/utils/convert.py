@@ -3,10 +3,20 @@
 import os
 import shlex
 import logging
+import subprocess
+
+from functools import lru_cache
+from concurrent.futures import as_completed
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 
 from .gen import run_shell
 
 
+# Default cap on worker processes, each of which loads a whole recording
+_MAX_PROCESSES = 4
+
+
 def dcm2nii(files, out, dst, **kwargs):
     """
     Convert DICOM files to NIfTI and write to disk.
@@ -19,17 +29,30 @@ def dcm2nii(files, out, dst, **kwargs):
         Output format desired.
     dst: Layout
         Destination layout where converted files will be stored.
+    using: str, optional
+        Either "dcm2bids" (default) or "dcm2niix". With "dcm2niix", the
+        converter is called directly and files are named using the
+        destination specification, skipping the dcm2bids wrapper.
     config: str
         Path to config file. Should be compatible with dcm2bids
-        version installed.
+        version installed. Not required when using dcm2niix.
+    concurrency: int, optional
+        Number of files converted at once. Defaults to the number of
+        CPUs available.
 
     Returns
     -------
     None
     """
 
+    concurrency = kwargs.get("concurrency", os.cpu_count())
+    if kwargs.get("using", "dcm2bids") == "dcm2niix":
+        _dcm2niix(files, dst, concurrency)
+        logging.info("Conversion to nii complete")
+        return
+
     # Set and build command
-    flags = kwargs.get("flags", None)
+    flags = kwargs.get("flags") or ()
     tmp = [
         "dcm2bids",
         "-d",
@@ -45,14 +68,12 @@ def dcm2nii(files, out, dst, **kwargs):
         "-l",
         "{verbose}",
     ]
-    if flags and not flags.issubset(_DCM2NII_VALID_FLAGS):
+    if set(flags) - _DCM2NII_VALID_FLAGS:
         raise ValueError(
             "Unsupported flag found \n"
             f"Valid flags: {','.join(_DCM2NII_VALID_FLAGS)}",
         )
-    if flags:
-        tmp.extend(flags)
-    tmp = shlex.join(tmp)
+    tmp.extend(flags)
 
     # Set logging level
     verbose = kwargs.get("logging", "INFO")
@@ -67,88 +88,145 @@ def dcm2nii(files, out, dst, **kwargs):
     if not tag_map:
         logging.info("Using default tag map")
         tag_map = {"subject": "subject", "session": "session"}
+    tag_items = list(tag_map.items())
 
-    logging.info(f"Using command template: {tmp}")
+    logging.info(f"Using command template: {shlex.join(tmp)}")
 
+    jobs = []
     for file in files:
         # Fill command with arguments
         args = {}
-        for param, tag in tag_map.items():
+        for param, tag in tag_items:
             tag = file.tags.get(tag, None)
             if tag:
-                args[param] = tag.value
+                args[param] = tag
         args["path"] = file.path
-        cmd = tmp.format(**args, dst=dst.root, verbose=verbose, config=config)
-        run_shell(cmd)
-        logging.info(f"Converted {file.path} and stored to {dst.root}")
+        cmd = [
+            t.format(**args, dst=dst.root, verbose=verbose, config=config)
+            for t in tmp
+        ]
+        jobs.append((file.path, cmd, dst.root))
+
+    _dispatch(_run_command, jobs, concurrency)
     logging.info("Conversion to nii complete")
 
 
+def _dcm2niix(files, dst, concurrency):
+    """Convert DICOM files by calling dcm2niix directly."""
+
+    # Use single threaded compression when several files convert at once
+    compress = "i" if concurrency and concurrency > 1 else "y"
+    tmp = [
+        "dcm2niix",
+        "-z",
+        compress,
+        "-b",
+        "y",
+        "-o",
+        "{dir}",
+        "-f",
+        "{name}",
+        "{path}",
+    ]
+    logging.info(f"Using command template: {shlex.join(tmp)}")
+
+    jobs, dirs = [], set()
+    for file in files:
+        new_tags = file.tags.copy()
+        new_tags["extension"] = "nii.gz"
+        new_tags["sourcetype"] = "None"
+        new_path = os.path.join(
+            dst.root, dst.specification.build_path(False, **new_tags)
+        )
+
+        # dcm2niix appends the extension to the name itself
+        args = {
+            "path": file.path,
+            "dir": os.path.dirname(new_path),
+            "name": os.path.basename(new_path).removesuffix(".nii.gz"),
+        }
+        dirs.add(args["dir"])
+
+        cmd = [t.format(**args) for t in tmp]
+        jobs.append((file.path, cmd, new_path))
+
+    # Create each destination directory once
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    _dispatch(_run_command, jobs, concurrency)
+
+
 def edf2asc(files, out, dst, **kwargs):
     """Convert Eye track data format and write to disk."""
 
     # Set and build command
     tmp = ["edf2asc", "{path}", "{new_path}"]
-    flags = kwargs.get("flags", None)
-    if flags and not flags.issubset(_EDF2ASC_VALID_FLAGS):
+    flags = kwargs.get("flags") or ()
+    if set(flags) - _EDF2ASC_VALID_FLAGS:
         raise ValueError(
             "Unsupported flag found. \n"
             f"Valid flags: {', '.join(_EDF2ASC_VALID_FLAGS)}"
         )
-    if flags:
-        tmp.extend(flags)
-    tmp = shlex.join(tmp)
+    tmp.extend(flags)
 
-    logging.info(f"Using command template: {tmp}")
+    logging.info(f"Using command template: {shlex.join(tmp)}")
 
+    jobs, dirs = [], set()
     for file in files:
         # Fill command with arguments
         args = {}
-        new_tags = {k: v for k, v in file.tags.items()}
-        new_tags.update({"extension": "asc", "sourcetype": "None"})
+        new_tags = file.tags.copy()
+        new_tags["extension"] = "asc"
+        new_tags["sourcetype"] = "None"
         new_path = os.path.join(
             dst.root, dst.specification.build_path(False, **new_tags)
         )
 
         args["path"] = file.path
         args["new_path"] = new_path
-        os.makedirs(os.path.dirname(new_path), exist_ok=True)
+        dirs.add(os.path.dirname(new_path))
 
-        cmd = tmp.format(**args)
-        run_shell(cmd)
+        cmd = [t.format(**args) for t in tmp]
+        jobs.append((file.path, cmd, new_path))
 
-        logging.info(f"Converted {file.path} and stored to {new_path}")
+    # Create each destination directory once
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    _dispatch(_run_command, jobs, kwargs.get("concurrency", os.cpu_count()))
     logging.info("Conversion to asc complete")
 
 
 def nirx2snirf(files, out, dst, **kwargs):
     """Convert NIRS data format and write to disk."""
 
-    import mne
-    import mne_nirs
+    anonymize = kwargs.get("anonymize", {})
 
+    jobs, dirs = [], set()
     for file in files:
-        raw = mne.io.read_raw_nirx(file.path)
-        raw.anonymize(**kwargs.get("anonymize", {}))
-
-        new_tags = {k: v for k, v in file.tags.items()}
-        new_tags.update({"extension": "snirf", "sourcetype": "None"})
+        new_tags = file.tags.copy()
+        new_tags["extension"] = "snirf"
+        new_tags["sourcetype"] = "None"
         new_path = os.path.join(
             dst.root, dst.specification.build_path(False, **new_tags)
         )
 
-        os.makedirs(os.path.dirname(new_path), exist_ok=True)
-        mne_nirs.io.write_raw_snirf(raw, new_path)
-        logging.info(f"Converted {file.path} and stored to {new_path}")
+        dirs.add(os.path.dirname(new_path))
+        jobs.append((file.path, new_path, anonymize))
+
+    # Create each destination directory once
+    for d in dirs:
+        os.makedirs(d, exist_ok=True)
+
+    concurrency = kwargs.get("concurrency", min(_MAX_PROCESSES, os.cpu_count()))
+    _dispatch(_nirx2snirf, jobs, concurrency, processes=True)
     logging.info("Conversion to snirf complete")
 
 
 def eeg_converter(files, out, dst, **kwargs):
     """Convert EEG data format and write to disk."""
 
-    import mne
-    import mne_bids
-
     # Set conversion logging level
     verbose = kwargs.get("logging", "INFO")
 
@@ -189,39 +267,100 @@ def eeg_converter(files, out, dst, **kwargs):
     else:
         logging.info(f"Using daysback of {anonymize['daysback']} to anonymize")
 
-    for file in files:
-        raw = mne.io.read_raw(file.path)
-        raw.info["line_freq"] = line_freq
+    options = {
+        "event_id": event_id,
+        "anonymize": anonymize,
+        "format": out,
+        "overwrite": overwrite,
+        "verbose": verbose,
+    }
 
+    jobs = []
+    map_items = tuple(tag_map.items())
+    for file in files:
         # Form BIDSPath parameters from tag mapped_column
-        path_params = {}
-        for param, tag in tag_map.items():
-            tag = file.tags.get(tag, None)
-            path_params[param] = tag if tag else None
-
-        path = mne_bids.BIDSPath(root=dst.root, **path_params)
-
-        mne_bids.write_raw_bids(
-            raw,
-            path,
-            event_id=event_id,
-            anonymize=anonymize,
-            format=out,
-            overwrite=overwrite,
-            verbose=verbose,
-        )
+        tags = file.tags
+        path_params = {param: tags.get(tag) or None for param, tag in map_items}
+        jobs.append((file.path, dst.root, path_params, line_freq, options))
 
-        logging.info(f"Converted {file.path} and stored to {path}")
+    # Writes update sidecars shared across the BIDS root, so run serially
+    _dispatch(_eeg_convert, jobs, 1)
     logging.info(f"Conversion to {out} format complete")
 
 
+def _dispatch(func, jobs, concurrency=None, processes=False):
+    """
+    Run per-file conversion jobs concurrently.
+
+    Parameters
+    ----------
+    func : callable
+        Worker that converts a single file and returns its destination.
+    jobs : list of tuple
+        Arguments for each call of func, the first being the source path.
+    concurrency : int, optional
+        Maximum number of conversions that run at once.
+    processes : bool, default False
+        Use a pool of processes instead of threads for CPU-bound workers.
+    """
+    pool = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with pool(max_workers=concurrency) as executor:
+        futures = {executor.submit(func, *job): job[0] for job in jobs}
+        for future in as_completed(futures):
+            logging.info(f"Converted {futures[future]} and stored to {future.result()}")
+
+
+def _run_command(path, cmd, dst):
+    """Run conversion command for file at path."""
+    process = run_shell(cmd)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd)
+    return dst
+
+
+def _nirx2snirf(path, new_path, anonymize):
+    """Convert a NIRx recording to SNIRF."""
+
+    import mne
+    import mne_nirs
+
+    raw = mne.io.read_raw_nirx(path)
+    raw.anonymize(**anonymize)
+    mne_nirs.io.write_raw_snirf(raw, new_path)
+    return new_path
+
+
+def _eeg_convert(path, root, path_params, line_freq, options):
+    """Convert an EEG recording to BIDS."""
+
+    import mne
+    import mne_bids
+
+    raw = mne.io.read_raw(path)
+    raw.info["line_freq"] = line_freq
+
+    # Entities shared across the batch are set once per worker
+    params = dict(path_params)
+    base = _bids_base(root, params.pop("datatype", None), params.pop("suffix", None))
+    bids_path = base.copy().update(**params)
+    mne_bids.write_raw_bids(raw, bids_path, **options)
+    return bids_path
+
+
+@lru_cache(maxsize=None)
+def _bids_base(root, datatype, suffix):
+    """Return BIDSPath with entities common to a conversion batch."""
+
+    import mne_bids
+
+    return mne_bids.BIDSPath(root=root, datatype=datatype, suffix=suffix)
+
+
 def convert(files, out, dst, **kwargs):
     """Convert a file collection from one format to another."""
 
     # Proceed only if all files have the same extension
-    extension = set()
-    for file in files:
-        extension.add(file.tags.get("extension"))
+    extension = {file.tags.get("extension") for file in files}
     if len(extension) > 1:
         raise TypeError(
             "Expected all files of same extension, but received different \n"
@@ -229,12 +368,8 @@ def convert(files, out, dst, **kwargs):
         )
 
     # Check if output format supported and choose converter
-    extension = extension.pop()
-    for outs in _SUPPORTED:
-        if out in outs and extension in _SUPPORTED[outs]["from"]:
-            converter = _SUPPORTED[outs]["using"]
-            break
-
+    extension = extension.pop() if extension else None
+    converter = _DISPATCH.get((out, extension))
     if not converter:
         raise ValueError(f"Extension {extension} or output {out} mismatch.")
 
@@ -271,40 +406,48 @@ _SUPPORTED = {
     ("NIfTI",): {"from": (".dcm",), "using": dcm2nii},
     ("SNIRF",): {"from": (".nirx",), "using": nirx2snirf},
 }
-_DCM2NII_VALID_FLAGS = {"--forceDcm2niix", "--clobber"}
-_EDF2ASC_VALID_FLAGS = {
-    "-t",
-    "-c",
-    "-z",
-    "-v",
-    "-y",
-    "-sp",
-    "-sh",
-    "-sg",
-    "-l",
-    "-nr",
-    "-r",
-    "-nl",
-    "-res",
-    "-vel",
-    "fvel",
-    "-s",
-    "-ne",
-    "-e",
-    "-ns",
-    "-nv",
-    "-nst",
-    "-nmsg",
-    "-neye",
-    "-nflags",
-    "-hpos",
-    "-avg",
-    "-ftime",
-    "-input",
-    "-buttons",
-    "-failsafe",
-    "-ntarget",
-    "-ntime_check",
-    "-npa_check",
-    "-logmsg",
+_DISPATCH = {
+    (o, e): spec["using"]
+    for outs, spec in _SUPPORTED.items()
+    for o in outs
+    for e in spec["from"]
 }
+_DCM2NII_VALID_FLAGS = frozenset({"--forceDcm2niix", "--clobber"})
+_EDF2ASC_VALID_FLAGS = frozenset(
+    {
+        "-t",
+        "-c",
+        "-z",
+        "-v",
+        "-y",
+        "-sp",
+        "-sh",
+        "-sg",
+        "-l",
+        "-nr",
+        "-r",
+        "-nl",
+        "-res",
+        "-vel",
+        "fvel",
+        "-s",
+        "-ne",
+        "-e",
+        "-ns",
+        "-nv",
+        "-nst",
+        "-nmsg",
+        "-neye",
+        "-nflags",
+        "-hpos",
+        "-avg",
+        "-ftime",
+        "-input",
+        "-buttons",
+        "-failsafe",
+        "-ntarget",
+        "-ntime_check",
+        "-npa_check",
+        "-logmsg",
+    }
+)
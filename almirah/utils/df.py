@@ -1,8 +1,10 @@
 """Dataframe manipulation utility functions."""
 
+import numpy as np
 import pandas as pd
 
 from typing import Any
+from functools import lru_cache
 
 from datetime import date
 from datetime import datetime
@@ -10,6 +12,25 @@ from datetime import datetime
 from .lib import extract_dtype_from_db_type_string
 
 
+_BOOLEAN_MAP = {
+    "1": True,
+    "0": False,
+    "True": True,
+    "False": False,
+    "Yes": True,
+    "No": False,
+}
+
+_PANDAS_TYPE_EQUIVALENT = {
+    int: "Int64",
+    str: "string",
+    bool: "boolean",
+    float: "float",
+    date: "datetime64[ns]",
+    datetime: "datetime64[ns]",
+}
+
+
 def common_rows(
     child: pd.DataFrame,
     parent: pd.DataFrame,
@@ -26,9 +47,11 @@ def common_rows(
     parent : pd.DataFrame
         The parent dataframe.
     child_on : Any
-        Column or index level names in child to join on.
+        Column names in child to join on. Defaults to the columns
+        common to child and parent.
     parent_on : Any
-        Column or index level names in parent to join on.
+        Column names in parent to join on. Defaults to the columns
+        common to child and parent.
 
     Returns
     -------
@@ -36,15 +59,22 @@ def common_rows(
         A Boolean series indicating common rows.
     """
 
-    merged = pd.merge(
-        child.reset_index(),
-        parent,
-        how="left",
-        left_on=child_on,
-        right_on=parent_on,
-        indicator=True,
-    ).set_index("index")
-    return merged["_merge"].eq("both")
+    if child_on is None and parent_on is None:
+        child_on = parent_on = [c for c in child.columns if c in parent.columns]
+
+    # Single column keys need no index, integer ones not even pandas
+    child_on, parent_on = _single_key(child_on), _single_key(parent_on)
+    if isinstance(child_on, str) and isinstance(parent_on, str):
+        child_keys = child[child_on].to_numpy()
+        parent_keys = parent[parent_on].to_numpy()
+        if child_keys.dtype.kind in "iub" and parent_keys.dtype.kind in "iub":
+            return pd.Series(np.isin(child_keys, parent_keys), index=child.index)
+        return child[child_on].isin(parent[parent_on])
+
+    # Hash lookup of child keys among parent keys without joining frames
+    child_keys = child.set_index(child_on).index
+    parent_keys = parent.set_index(parent_on).index
+    return pd.Series(child_keys.isin(parent_keys), index=child.index)
 
 
 def convert_column_type(
@@ -73,34 +103,34 @@ def convert_column_type(
     """
     dtype, _ = extract_dtype_from_db_type_string(type_string)
 
-    if dtype == str:
-        series = series.astype(dtype)
+    # Types below already have their final dtype after conversion
+    if dtype == "str":
+        return series.astype("string")
 
     elif dtype == "datetime":
-        series = pd.to_datetime(series, errors="coerce", **kwargs)
+        return pd.to_datetime(series, errors="coerce", **kwargs)
 
     elif dtype == "date":
-        series = pd.to_datetime(series, errors="coerce", **kwargs).dt.date
+        return pd.to_datetime(series, errors="coerce", **kwargs).dt.date
 
-    elif dtype in {"float", "integer"}:
+    elif dtype == "boolean":
+        return series.map(_BOOLEAN_MAP).astype(dtype)
+
+    elif dtype == "float":
+        # Kept at double precision, as downcasting to float32 loses digits
+        return pd.to_numeric(series, errors="coerce").astype("Float64")
+
+    elif dtype == "integer":
         series = pd.to_numeric(series, errors="coerce", downcast=dtype)
 
-    elif dtype == "boolean":
-        series = series.map(
-            {
-                "1": True,
-                "0": False,
-                "True": True,
-                "False": False,
-                "Yes": True,
-                "No": False,
-            }
-        )
-        series = series.astype(dtype)
+        # Nullable dtype is known unless integers were left as floats
+        if series.dtype.kind == "i":
+            return series.astype(series.dtype.name.capitalize())
 
     return series.convert_dtypes()
 
 
+@lru_cache(maxsize=128)
 def python_to_pandas_type(python_type: Any) -> str:
     """Return pandas type equivalent of python type.
 
@@ -114,12 +144,11 @@ def python_to_pandas_type(python_type: Any) -> str:
     str
         String representation of a pandas dtype.
     """
-    PANDAS_TYPE_EQUIVALENT = {
-        int: "Int64",
-        str: "string",
-        bool: "boolean",
-        float: "float",
-        date: "datetime64[ns]",
-        datetime: "datetime64[ns]",
-    }
-    return PANDAS_TYPE_EQUIVALENT[python_type]
+    return _PANDAS_TYPE_EQUIVALENT[python_type]
+
+
+def _single_key(on: Any) -> Any:
+    """Return sole column name if only one given in a list of columns."""
+    if isinstance(on, (list, tuple)) and len(on) == 1:
+        return on[0]
+    return on
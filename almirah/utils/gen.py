@@ -3,17 +3,55 @@
 import os
 import re
 import json
+import stat
 import yaml
+import shlex
 import shutil
 import logging
 import subprocess
 
 from pathlib import Path
-from functools import reduce
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 from typing import Any
 from typing import List
 from typing import Dict
+from typing import Tuple
+from typing import Iterator
+from typing import Union
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+_MISSING = object()
+
+_COPY_MODES = {"copy", "link", "reflink"}
+
+# Linux ioctl request cloning a whole file on copy-on-write filesystems
+_FICLONE = 0x40049409
+
+# Characters with special meaning to the shell beyond splitting words,
+# or leading NAME=value assignments to the environment of the command
+_SHELL_SYNTAX = re.compile(r"[|&;<>()$`*?\[\]{}~!#\n]|^\s*[A-Za-z_]\w*=")
+
+# Use LibYAML bindings when PyYAML is built with them
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1024)
+def _split_keys(keys: str) -> Tuple[str, ...]:
+    """Return dotted keys split into a tuple of its parts."""
+    return tuple(keys.split("."))
 
 
 def commafy(sequence: List[Any]) -> str:
@@ -21,59 +59,216 @@ def commafy(sequence: List[Any]) -> str:
     return ", ".join(map(str, sequence))
 
 
-def copy(src: str, dst: str, overwrite: bool = False) -> None:
-    """Copy content from source path to destination path."""
-
-    if not os.path.exists(src):
+def copy(src: str, dst: str, overwrite: bool = False, mode: str = "copy") -> None:
+    """
+    Copy content from source path to destination path.
+
+    Parameters
+    ----------
+    src : str
+        Path to the file or directory to copy.
+    dst : str
+        Path at which the copy is to be placed.
+    overwrite : bool, default False
+        If True, existing content at destination is replaced.
+    mode : {'copy', 'link', 'reflink'}, default 'copy'
+        How file contents are transferred.
+        - 'copy' : Copy file contents and metadata.
+        - 'link' : Create a hard link to the source file.
+        - 'reflink' : Share data blocks with the source file on
+          copy-on-write filesystems.
+        Modes other than 'copy' fall back to it when not supported.
+    """
+
+    if mode not in _COPY_MODES:
+        raise ValueError(f"Unsupported copy mode '{mode}'")
+
+    # Stat each path once and reuse the result for all checks below
+    src_stat = _stat(src)
+    if src_stat is None:
         raise FileNotFoundError(f"No file found on {src}")
 
     if not dst:
         raise TypeError("Expected destination path, received None")
 
-    if os.path.exists(dst) and not overwrite:
+    dst_stat = _stat(dst)
+    if dst_stat is not None and not overwrite:
         logging.error(f"Skipping copy of {src} to {dst} as file exists")
         return
 
-    if os.path.exists(dst) and overwrite:
+    if dst_stat is not None:
         logging.warning(f"Overwriting and copying {src} to {dst}")
-        remover = shutil.rmtree if os.path.isdir(dst) else os.remove
+        remover = shutil.rmtree if stat.S_ISDIR(dst_stat.st_mode) else os.remove
         remover(dst)
 
     logging.debug(f"Initiating copy of {src} to {dst}")
-    copier = shutil.copytree if os.path.isdir(src) else shutil.copy2
+    copier = _copytree if stat.S_ISDIR(src_stat.st_mode) else _copy_file
     os.makedirs(os.path.dirname(dst), exist_ok=True)
-    copier(src, dst)
+    copier(src, dst, mode)
+
+
+def _stat(path: str) -> Optional[os.stat_result]:
+    """Return stat of path following symlinks, None if it does not exist."""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _copy_file(src: str, dst: str, mode: str = "copy") -> None:
+    """Copy file using mode, falling back to a regular copy on failure."""
+    try:
+        if mode == "link":
+            return os.link(src, dst)
+
+        if mode == "reflink":
+            return _reflink(src, dst)
+
+    except (OSError, AttributeError) as e:
+        logging.debug(f"Unable to {mode} {src}, falling back to copy: {e}")
+
+    shutil.copy2(src, dst)
+
+
+def _reflink(src: str, dst: str) -> None:
+    """Copy file within the kernel, sharing blocks where supported."""
+    with open(src, "rb") as s, open(dst, "wb") as d:
+        if not _clone(s.fileno(), d.fileno()):
+            remaining = os.fstat(s.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(s.fileno(), d.fileno(), remaining)
+                if not copied:
+                    raise OSError(f"Copy of {src} ended {remaining} bytes short")
+                remaining -= copied
+    shutil.copystat(src, dst)
+
+
+def _clone(src_fd: int, dst_fd: int) -> bool:
+    """Return True if file was cloned with the FICLONE ioctl."""
+    if fcntl is None:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+    except OSError:
+        return False
+    return True
+
+
+def _copytree(
+    src: str, dst: str, mode: str = "copy", workers: Optional[int] = None
+) -> None:
+    """Copy directory tree with files copied concurrently."""
+    pairs = []
+    for dir, _, files in os.walk(src, followlinks=True):
+        target = os.path.join(dst, os.path.relpath(dir, src))
+        os.makedirs(target, exist_ok=True)
+        pairs.extend((os.path.join(dir, f), os.path.join(target, f)) for f in files)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda p: _copy_file(*p, mode), pairs))
+
+    for dir, _, _ in os.walk(src, followlinks=True):
+        shutil.copystat(dir, os.path.join(dst, os.path.relpath(dir, src)))
+
+
+def copy_many(
+    pairs: List[Tuple[str, str]],
+    overwrite: bool = False,
+    mode: str = "copy",
+    workers: Optional[int] = None,
+) -> None:
+    """
+    Copy source, destination pairs concurrently.
+
+    Pairs sharing a destination resolve as sequential copies would:
+    the first is kept unless overwrite is set, when the last is.
+
+    Parameters
+    ----------
+    pairs : list of (str, str)
+        Source and destination paths to copy.
+    overwrite : bool, default False
+        If True, existing content at destination is replaced, unless
+        it is a file of the same size and no older than the source.
+    mode : {'copy', 'link', 'reflink'}, default 'copy'
+        How file contents are transferred. See `copy`.
+    workers : int, optional
+        Maximum number of concurrent copies.
+    """
+    targets = {}
+    for src, dst in pairs:
+        if dst in targets and not overwrite:
+            logging.error(f"Skipping copy of {src} to {dst} as file exists")
+            continue
+        targets.pop(dst, None)
+        targets[dst] = src
+
+    # Overwriting a file with an identical looking copy can be skipped
+    if overwrite:
+        for dst in [d for d, s in targets.items() if _up_to_date(s, d)]:
+            logging.debug(f"Skipping copy to {dst} as it is up to date")
+            del targets[dst]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda t: copy(t[1], t[0], overwrite, mode), targets.items()))
+    logging.info(f"Copied {len(targets)} files to target")
+
+
+def _up_to_date(src: str, dst: str) -> bool:
+    """Return True if dst is a file as large and as recent as src."""
+    try:
+        s, d = os.stat(src), os.stat(dst)
+    except FileNotFoundError:
+        return False
+    return (
+        stat.S_ISREG(s.st_mode)
+        and stat.S_ISREG(d.st_mode)
+        and s.st_size == d.st_size
+        and d.st_mtime >= s.st_mtime
+    )
 
 
 def deep_get(dictionary: Dict[Any, Any], keys: str, default: Any = None) -> Any:
     """dict.get() for nested dictionaries."""
-    return reduce(
-        lambda d, key: d.get(key, default) if isinstance(d, dict) else default,
-        keys.split("."),
-        dictionary,
-    )
-
-
-def denest_dict(dictionary: Dict[Any, Any]) -> Dict[Any, Any]:
-    """Return denested dict with all nested elements removed."""
-    return {k: v for k, v in dictionary.items() if not isinstance(v, dict)}
+    for key in _split_keys(keys):
+        if not isinstance(dictionary, dict):
+            return default
+        dictionary = dictionary.get(key, _MISSING)
+        if dictionary is _MISSING:
+            return default
+    return dictionary
+
+
+def denest_dict(dictionary: Dict[Any, Any], sep: str = ".") -> Dict[Any, Any]:
+    """Return denested dict with nested keys joined by separator."""
+    denested = {}
+    stack = [("", dictionary)]
+    while stack:
+        prefix, value = stack.pop()
+        if not isinstance(value, dict):
+            denested[prefix] = value
+            continue
+        for k, v in reversed(value.items()):
+            stack.append((f"{prefix}{sep}{k}" if prefix else k, v))
+    return denested
+
+
+def expand_user(path: str) -> str:
+    """Return path with ~ expanded, skipping the lookup for other paths."""
+    return os.path.expanduser(path) if path.startswith("~") else path
 
 
 def filename(path: str) -> str:
     """Return the filename without extension given the path."""
-    return os.path.splitext(os.path.basename(os.path.expanduser(path)))[0]
+    path = expand_user(path)
+    base = path[path.rfind(os.sep) + 1 :]
+    stem, _, _ = base.rpartition(".")
+    return stem if stem.lstrip(".") else base
 
 
 def get_dir_contents(root: str, pattern: str, skip: List[str] = None) -> List[str]:
     """Return list of contents in a directory that match pattern."""
-    m = []
-    for dir, subdirs, files in os.walk(root):
-        contents = subdirs + files
-        for content in contents:
-            if re.match(pattern, content):
-                m.append(os.path.join(dir, content))
-    matches = [c for c in m if not any([re.search(s, c) for s in skip or []])]
-    return matches
+    return [entry.path for entry in iter_dir_matches(root, pattern, skip)]
 
 
 def get_incomplete_keys(dict: Dict[Any, Any]) -> List[Any]:
@@ -85,12 +280,53 @@ def get_metadata(path: str) -> Dict[str, Any]:
     """Return dict equivalent of json in file."""
     path = Path(path).with_suffix(".json")
 
-    if not path.exists:
+    # Opening directly saves a stat for the common case of a sidecar
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
         return dict()
 
-    with open(path) as file:
-        content = json.load(file)
-        return content
+    with file:
+        if not orjson:
+            return json.load(file)
+        data = file.read()
+
+    # Sidecars with NaN or Infinity are only accepted by json
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        return json.loads(data)
+
+
+def iter_dir_matches(
+    root: str, pattern: str, skip: List[str] = None
+) -> Iterator[os.DirEntry]:
+    """Yield directory entries under root whose names match pattern."""
+    pattern = re.compile(pattern)
+    skip = [re.compile(s) for s in skip or []]
+
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if pattern.match(entry.name) and not any(
+                    s.search(entry.path) for s in skip
+                ):
+                    yield entry
+
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
+def iter_multi_yaml(path: str) -> Iterator[Dict[Any, Any]]:
+    """Yield dict equivalents of yamls in file one at a time."""
+    with open(os.path.expanduser(path)) as file:
+        yield from yaml.load_all(file, Loader=_YAML_LOADER)
 
 
 def listify(dictionary: dict) -> Dict[str, List]:
@@ -103,17 +339,51 @@ def listify(dictionary: dict) -> Dict[str, List]:
 def read_yaml(path: str) -> Dict[Any, Any]:
     """Return dict equivalent of yaml in file."""
     with open(os.path.expanduser(path)) as file:
-        return yaml.safe_load(file)
+        return yaml.load(file, Loader=_YAML_LOADER)
 
 
 def read_multi_yaml(path: str) -> List[Dict[Any, Any]]:
     """Return list of dict equivalents of yamls in file."""
-    with open(os.path.expanduser(path)) as file:
-        return [f for f in yaml.safe_load_all(file)]
-
-
-def run_shell(cmd: str, suppress_output: bool = True) -> subprocess.CompletedProcess:
-    """Execute shell command in background."""
-    return subprocess.run(
-        cmd, shell=True, stdout=subprocess.DEVNULL if suppress_output else None
-    )
+    return list(iter_multi_yaml(path))
+
+
+def run_shell(
+    cmd: Union[str, List[str]], suppress_output: bool = True, wait: bool = True
+) -> subprocess.Popen:
+    """
+    Execute command, using a shell only for strings that need one.
+
+    Parameters
+    ----------
+    cmd : str or list of str
+        Command line, or program and arguments run without a shell.
+    suppress_output : bool, default True
+        If True, standard output of the command is discarded.
+    wait : bool, default True
+        If True, return only once the command has exited.
+
+    Returns
+    -------
+    subprocess.Popen
+        The process, with returncode set if waited on.
+
+    Raises
+    ------
+    OSError
+        If the program of a list command cannot be run. String commands
+        fall back to the shell, which exits with status 127 or 126.
+    """
+    output = subprocess.DEVNULL if suppress_output else None
+
+    if isinstance(cmd, str) and not _SHELL_SYNTAX.search(cmd):
+        # Builtins and programs that fail to run are left to the shell
+        try:
+            process = subprocess.Popen(shlex.split(cmd), stdout=output)
+        except OSError:
+            process = subprocess.Popen(cmd, shell=True, stdout=output)
+    else:
+        process = subprocess.Popen(cmd, shell=isinstance(cmd, str), stdout=output)
+
+    if wait:
+        process.wait()
+    return process
@@ -3,8 +3,13 @@
 import re
 from typing import Tuple
 from pathlib import Path
+from functools import lru_cache
 
 
+_TYPE_STRING_PATTERN = re.compile(r"(\w+).?(\d+)?")
+
+
+@lru_cache(maxsize=256)
 def extract_dtype_from_db_type_string(
     type_string: str, default_length: int = 250
 ) -> Tuple[str, int]:
@@ -33,7 +38,7 @@ def extract_dtype_from_db_type_string(
 
     SUPPORTED_DTYPES = {"str", "date", "float", "boolean", "integer", "datetime"}
 
-    match = re.match(r"(\w+).?(\d+)?", type_string)
+    match = _TYPE_STRING_PATTERN.match(type_string)
     if not match:
         raise ValueError(f"Invalid type string format: {type_string}")
 
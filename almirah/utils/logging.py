@@ -1,5 +1,6 @@
 """Logging utility functions."""
 
+import io
 import logging
 import pandas as pd
 from typing import List, Union
@@ -28,8 +29,12 @@ def log_df(
     kwargs: key, value mappings
         Other keyword arguments are passed to `str.format()`.
     """
-    if not df.empty:
-        logging.log(level, msg + "\n%s", df.drop(columns=hide).to_string(), **kwargs)
+    if df.empty or not logging.getLogger().isEnabledFor(level):
+        return
+
+    buf = io.StringIO()
+    df.drop(columns=hide).to_csv(buf, sep="\t")
+    logging.log(level, msg + "\n%s", buf.getvalue(), **kwargs)
 
 
 def log_col(
@@ -56,9 +61,13 @@ def log_col(
         Other keyword arguments are passed to `str.format()`.
     """
 
+    if series.empty or not logging.getLogger().isEnabledFor(level):
+        return
+
     if hide:
         series = series.index.to_series()
         logging.info("Column values will not be displayed as hide set")
 
-    if not series.empty:
-        logging.log(level, msg + "\n%s", series.to_string(), **kwargs)
+    buf = io.StringIO()
+    series.to_csv(buf, sep="\t")
+    logging.log(level, msg + "\n%s", buf.getvalue(), **kwargs)
@@ -1,6 +1,7 @@
 """SQLAlchemy utility functions."""
 
 from typing import Type
+from functools import lru_cache
 
 from sqlalchemy.types import Date
 from sqlalchemy.types import Float
@@ -13,6 +14,17 @@ from sqlalchemy.types import TypeEngine
 from .lib import extract_dtype_from_db_type_string
 
 
+_SQL_TYPE_EQUIVALENT = {
+    "str": String,
+    "date": Date,
+    "float": Float,
+    "boolean": Boolean,
+    "integer": Integer,
+    "datetime": DateTime,
+}
+
+
+@lru_cache(maxsize=128)
 def get_sql_type(type_string: str, default_length: int = 250) -> Type[TypeEngine]:
     """
     Return the SQLAlchemy type equivalent for a given type string representation.
@@ -35,18 +47,9 @@ def get_sql_type(type_string: str, default_length: int = 250) -> Type[TypeEngine
         If the type string does not correspond to a supported SQLAlchemy type.
     """
 
-    SQL_TYPE_EQUIVALENT = {
-        "str": String,
-        "date": Date,
-        "float": Float,
-        "boolean": Boolean,
-        "integer": Integer,
-        "datetime": DateTime,
-    }
-
     dtype, length = extract_dtype_from_db_type_string(type_string, default_length)
-    if dtype not in SQL_TYPE_EQUIVALENT:
+    if dtype not in _SQL_TYPE_EQUIVALENT:
         raise ValueError(f"Unsupported dtype '{dtype}' encountered.")
 
-    sql_type = SQL_TYPE_EQUIVALENT[dtype]
+    sql_type = _SQL_TYPE_EQUIVALENT[dtype]
     return sql_type(length) if length else sql_type()
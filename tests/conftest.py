@@ -0,0 +1,7 @@
+"""Shared configuration for the test suite."""
+
+import os
+import tempfile
+
+# Point the index to a scratch database before almirah is imported
+os.environ["INDEX_PATH"] = os.path.join(tempfile.mkdtemp(), "index.sqlite")
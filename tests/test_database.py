@@ -0,0 +1,66 @@
+"""Module to test the database.py submodule."""
+
+import sqlite3
+
+from sqlalchemy import text
+
+from almirah import Database
+
+
+def _journal_mode(db):
+    return db.connection.execute(text("PRAGMA journal_mode")).scalar()
+
+
+def test_connect_forwards_pragmas(tmp_path):
+    db = Database(name=str(tmp_path / "tuned.sqlite"), host="", backend="sqlite")
+    db.connect(pragmas={"journal_mode": "WAL"})
+    try:
+        assert _journal_mode(db) == "wal"
+    finally:
+        db.db.close()
+
+
+def test_connect_without_pragmas(tmp_path):
+    db = Database(name=str(tmp_path / "plain.sqlite"), host="", backend="sqlite")
+    db.connect()
+    try:
+        assert _journal_mode(db) == "delete"
+    finally:
+        db.db.close()
+
+
+def test_reconnect_reflects_new_tables(tmp_path):
+    path = tmp_path / "shared.sqlite"
+    db = Database(name=str(path), host="", backend="sqlite")
+    db.connect()
+    assert "samples" not in db.meta.tables
+
+    # Table created outside of this connection
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE samples (id INTEGER PRIMARY KEY)")
+    conn.close()
+
+    db.connect()
+    try:
+        assert "samples" in db.meta.tables
+    finally:
+        db.db.close()
+
+
+def test_report_keeps_connection_open(tmp_path, capsys):
+    db = Database(name=str(tmp_path / "report.sqlite"), host="", backend="sqlite")
+    db.connect()
+    db.create_table("samples", [{"name": "id", "dtype": "integer", "primary": True}])
+    try:
+        db.report()
+        assert not db.connection.closed
+
+        with db.transaction() as conn:
+            conn.execute(text("INSERT INTO samples (id) VALUES (1)"))
+            db.report()
+            conn.execute(text("INSERT INTO samples (id) VALUES (2)"))
+
+        assert db.connection.scalar(text("SELECT COUNT(*) FROM samples")) == 2
+        assert "samples" in capsys.readouterr().out
+    finally:
+        db.db.close()
@@ -0,0 +1,39 @@
+"""Module to test the core/db.py submodule."""
+
+import sqlite3
+
+from sqlalchemy import text
+
+from almirah.core import DBManager
+
+
+def _create(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE samples (id INTEGER PRIMARY KEY)")
+    conn.close()
+
+
+def test_read_only_database_with_pragmas(tmp_path):
+    path = tmp_path / "data.sqlite"
+    _create(path)
+
+    url = f"sqlite:///file:{path}?mode=ro&uri=true"
+    db = DBManager(url, pragmas={"journal_mode": "WAL", "synchronous": "OFF"})
+    try:
+        mode = db.connection.execute(text("PRAGMA journal_mode")).scalar()
+        assert mode == "delete"
+        assert "samples" in db.metadata.tables
+    finally:
+        db.close()
+
+
+def test_pragmas_unset_by_default(tmp_path):
+    path = tmp_path / "data.sqlite"
+    _create(path)
+
+    db = DBManager(f"sqlite:///{path}")
+    try:
+        mode = db.connection.execute(text("PRAGMA journal_mode")).scalar()
+        assert mode == "delete"
+    finally:
+        db.close()
@@ -0,0 +1,24 @@
+"""Module to test the utils/df.py submodule."""
+
+import pandas as pd
+import pytest
+
+from almirah.utils.df import convert_column_type
+
+
+@pytest.mark.parametrize(
+    "values, type_string, dtype, expected",
+    [
+        (["1.5", "2", None], "float", "Float64", [1.5, 2.0, pd.NA]),
+        (["1.0", "2.0", None], "float", "Float64", [1.0, 2.0, pd.NA]),
+        (["0.1", "x"], "float", "Float64", [0.1, pd.NA]),
+        (["1", "2", "3"], "integer", "Int8", [1, 2, 3]),
+        (["1", "300", None], "integer", "Int64", [1, 300, pd.NA]),
+        (["a", "b", None], "str", "string", ["a", "b", pd.NA]),
+        (["a", "b"], "str(10)", "string", ["a", "b"]),
+        (["1", "False", "Yes", "x"], "boolean", "boolean", [True, False, True, pd.NA]),
+    ],
+)
+def test_convert_column_type(values, type_string, dtype, expected):
+    series = convert_column_type(pd.Series(values), type_string)
+    pd.testing.assert_series_equal(series, pd.Series(expected, dtype=dtype))
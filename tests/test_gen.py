@@ -0,0 +1,31 @@
+"""Module to test the utils/gen.py submodule."""
+
+import math
+
+from almirah.utils import gen
+from almirah.utils.gen import get_metadata
+
+
+def test_get_metadata_non_finite_values(tmp_path):
+    (tmp_path / "sub-01.json").write_text('{"a": NaN, "b": Infinity, "c": 1}')
+
+    meta = get_metadata(str(tmp_path / "sub-01.csv"))
+    assert math.isnan(meta["a"])
+    assert meta["b"] == math.inf
+    assert meta["c"] == 1
+
+
+def test_get_metadata_missing_sidecar(tmp_path):
+    assert get_metadata(str(tmp_path / "sub-01.csv")) == {}
+
+
+def test_copy_falls_back_on_short_reflink(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src.bin", tmp_path / "dst.bin"
+    src.write_bytes(b"x" * 4096)
+
+    # Kernel copy that stops early, as on a source truncated mid-copy
+    monkeypatch.setattr(gen, "_clone", lambda *args: False)
+    monkeypatch.setattr(gen.os, "copy_file_range", lambda *args: 0, raising=False)
+
+    gen.copy(str(src), str(dst), mode="reflink")
+    assert dst.read_bytes() == src.read_bytes()
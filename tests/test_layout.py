@@ -0,0 +1,101 @@
+"""Module to test the layout.py submodule."""
+
+import os
+import json
+import threading
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+from almirah import File
+from almirah import index
+from almirah import Layout
+from almirah import Specification
+
+
+@pytest.fixture
+def spec():
+    details = {
+        "tags": [
+            {"name": "subject", "pattern": r"[/\\]?sub-([a-zA-Z0-9]+)"},
+            {"name": "extension", "pattern": r"[^./\\](\.[^/\\]+)$"},
+        ],
+        "path_patterns": ["sub-{subject}{extension}"],
+    }
+    return Specification(name="layout-test", details=details)
+
+
+@pytest.fixture
+def root(tmp_path):
+    for name in ["sub-01", "sub-02"]:
+        (tmp_path / f"{name}.csv").write_text("a,b\n1,2\n")
+        with open(tmp_path / f"{name}.json", "w") as f:
+            json.dump({"SamplingFrequency": 250.0, "Channels": 8, "Raw": True}, f)
+    return str(tmp_path)
+
+
+def test_index_metadata_non_string_values(spec, root):
+    layout = Layout(root=root, specification_name=spec.name)
+    layout.index(metadata=True, valid_only=False)
+    index.commit()
+
+    file = layout.query(returns="file", subject="01", extension=".csv")
+    assert len(file) == 1
+    assert file[0].tags["SamplingFrequency"] == "250.0"
+    assert file[0].tags["Channels"] == "8"
+    assert file[0].tags["Raw"] == "1"
+
+
+def test_bulk_tag_reuses_stored_tags(spec, root):
+    layout = Layout(root=root, specification_name=spec.name)
+    ids = layout.bulk_add(os.path.join(root, "sub-01.csv"))
+    tags = {i: {"flag": True, "count": 1, "ratio": 1.0} for i in ids.values()}
+    layout.bulk_tag(tags)
+    layout.bulk_tag(tags)
+    index.commit()
+
+    file = layout.query(returns="file", flag="1")
+    assert len(file) == 1
+    assert file[0].tags["count"] == "1"
+    assert file[0].tags["ratio"] == "1.0"
+
+
+def test_unique_instances_per_thread(root):
+    path = os.path.join(root, "sub-01.csv")
+    file = File(path=path)
+    assert File(path=path) is file
+    index.commit()
+
+    def create():
+        try:
+            return File(path=path)
+        finally:
+            index.remove()
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        other = executor.submit(create).result()
+
+    assert other is not file
+    assert other.path == file.path
+
+
+def test_sessions_in_many_threads(root):
+    layout = Layout(root=root, specification_name="layout-test")
+    index.commit()
+
+    # More threads holding sessions at once than the pool keeps connections
+    threads = 10
+    barrier = threading.Barrier(threads)
+
+    def count():
+        try:
+            first = index.options(File, root=layout.root)
+            barrier.wait(timeout=10)
+            return len(first), len(index.options(File, root=layout.root))
+        finally:
+            index.remove()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        counts = list(executor.map(lambda _: count(), range(threads)))
+
+    assert counts == [(len(layout.files), len(layout.files))] * threads
@@ -1,11 +1,14 @@
-"""Module to test the data.standard.py submodule."""
+"""Module to test the specification.py submodule."""
 
 import os
+import copy
 import yaml
 import pytest
 import tempfile
 
-from napi.data.standard import Specification
+from almirah import Specification
+
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 
 @pytest.fixture
@@ -13,17 +16,26 @@ def entities():
     return {"subject": "01", "session": "01", "datatype": "nirs", "suffix": "nirs"}
 
 
-@pytest.fixture
-def spec():
+@pytest.fixture(scope="session")
+def spec_config():
     with open("./tests/configs/specification.yaml") as f:
-        config = yaml.load(f, yaml.SafeLoader)
-        return Specification("sample", config)
+        return yaml.load(f, Loader)
 
 
-@pytest.fixture
-def rules():
+@pytest.fixture(scope="session")
+def rules_config():
     with open("./tests/configs/rules.yaml") as f:
-        return yaml.load(f, yaml.SafeLoader)
+        return yaml.load(f, Loader)
+
+
+@pytest.fixture
+def spec(spec_config):
+    return Specification(name="sample", details=copy.deepcopy(spec_config))
+
+
+@pytest.fixture
+def rules(rules_config):
+    return copy.deepcopy(rules_config)
 
 
 @pytest.fixture
@@ -44,8 +56,8 @@ def raw():
     d.cleanup()
 
 
-def test_get_valid_entities(spec):
-    assert spec.get_valid_entities() == [
+def test_tags(spec):
+    assert spec.tags == [
         "subject",
         "session",
         "datatype",
@@ -55,10 +67,14 @@ def test_get_valid_entities(spec):
 
 
 def test_build_path(spec, entities):
-    assert spec.build_path(entities) == "sub-01/ses-01/nirs/sub-01_ses-01_nirs.nirs"
+    assert spec.build_path(**entities) == "sub-01/ses-01/nirs/sub-01_ses-01_nirs.nirs"
 
 
-def test_organize(spec, rules, raw, dst):
+def test_organize(spec, rules, rules_config, raw, dst):
     rules.update({"source": raw.name, "destination": dst.name})
     spec.organize(rules)
     assert len(os.listdir(raw.name)) == sum([len(f) for _, _, f in os.walk(dst.name)])
+
+    # Config parsed once per session is left untouched for other tests
+    assert rules_config["source"] is None
+    assert rules_config["destination"] is None